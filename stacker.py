@@ -1,10 +1,74 @@
 import os
+import sys
 import time
+import mmap
+import pickle
+import re
+import threading
 import ctypes
+from concurrent.futures import ThreadPoolExecutor
 from ctypes import wintypes
 import psutil
 
 
+CACHE_FILE = os.path.join(os.path.dirname(os.path.abspath(sys.argv[0])), "stacker_cache.pkl")
+
+if os.name == "nt":
+    EnumWindowsProc = ctypes.WINFUNCTYPE(wintypes.BOOL, wintypes.HWND, wintypes.LPARAM)
+
+    _user32 = ctypes.windll.user32
+
+    _EnumWindows = _user32.EnumWindows
+    _EnumWindows.argtypes = [EnumWindowsProc, wintypes.LPARAM]
+    _EnumWindows.restype = wintypes.BOOL
+
+    _IsWindow = _user32.IsWindow
+    _IsWindow.argtypes = [wintypes.HWND]
+    _IsWindow.restype = wintypes.BOOL
+
+    _IsWindowVisible = _user32.IsWindowVisible
+    _IsWindowVisible.argtypes = [wintypes.HWND]
+    _IsWindowVisible.restype = wintypes.BOOL
+
+    _GetWindowTextLengthW = _user32.GetWindowTextLengthW
+    _GetWindowTextLengthW.argtypes = [wintypes.HWND]
+    _GetWindowTextLengthW.restype = ctypes.c_int
+
+    _GetWindowTextW = _user32.GetWindowTextW
+    _GetWindowTextW.argtypes = [wintypes.HWND, wintypes.LPWSTR, ctypes.c_int]
+    _GetWindowTextW.restype = ctypes.c_int
+
+# .osu field name -> read_beatmap_info key
+FIELD_MAP = {
+    "Title": "title",
+    "Artist": "artist",
+    "Creator": "creator",
+    "Version": "version",
+    "BeatmapID": "beatmap_id",
+    "HPDrainRate": "hp",
+    "CircleSize": "cs",
+    "ApproachRate": "ar",
+    "OverallDifficulty": "od",
+}
+
+# Matches "Field:value" lines for every field in FIELD_MAP
+META_RE = re.compile(
+    rb"^[ \t]*(" + b"|".join(key.encode() for key in FIELD_MAP) + rb"):(.*)$",
+    re.MULTILINE
+)
+
+# Metadata and difficulty sections always come before this one
+META_BLOCK_END = b"[Events]"
+
+# Threads used to scan Songs folder (lower it for HDDs)
+try:
+    SCAN_WORKERS = max(1, int(os.environ.get("STACKER_SCAN_WORKERS", 16)))
+except ValueError:
+    SCAN_WORKERS = 16
+
+# Smaller files are read directly instead of memory-mapped
+MMAP_MIN_SIZE = 16 * 1024
+
 
 class OsuBeatmapDetector:
     """Beatmap detector via osu! window title"""
@@ -14,10 +78,46 @@ class OsuBeatmapDetector:
         self.osu_dir = None
         self.songs_folder = None
         self.current_title = None
+        self._cached_hwnd = None
+        self._title_buffer = ctypes.create_unicode_buffer(512)
+        # file_path -> (mtime, (artist, title, version, creator))
+        self._meta_cache = self._load_cache()
+        self._cache_dirty = False
+        self._cache_lock = threading.Lock()
+        # folder_path -> (mtime_ns, [(path, meta)]), kept for this session only
+        self._folder_cache = {}
+        # (artist_lower, title_lower) -> [(path, version, creator, folder_name)]
+        self._title_index = None
+        self._songs_mtime = None
+
+    def _load_cache(self):
+        """Load parsed .osu metadata from cache file"""
+        try:
+            with open(CACHE_FILE, 'rb') as f:
+                cache = pickle.load(f)
+            if isinstance(cache, dict):
+                return cache
+        except Exception:
+            pass
+        return {}
+
+    def _save_cache(self):
+        """Save parsed .osu metadata to cache file"""
+        if not self._cache_dirty:
+            return
+        try:
+            with open(CACHE_FILE, 'wb') as f:
+                pickle.dump(self._meta_cache, f, pickle.HIGHEST_PROTOCOL)
+            self._cache_dirty = False
+        except Exception:
+            pass
 
     def find_osu_process(self):
         """Find osu! process"""
-        for proc in psutil.process_iter(['name', 'pid', 'exe']):
+        if self.recheck():
+            return True
+
+        for proc in psutil.process_iter(['name', 'pid']):
             try:
                 if proc.info['name'] and 'osu!' in proc.info['name']:
                     self.process = proc
@@ -26,6 +126,15 @@ class OsuBeatmapDetector:
                 continue
         return False
 
+    def recheck(self):
+        """Check that previously found osu! process is still running"""
+        if not self.process:
+            return False
+        try:
+            return self.process.is_running() and 'osu!' in self.process.name()
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            return False
+
     def get_osu_directory(self):
         """Get osu! directory"""
         if self.process:
@@ -42,24 +151,35 @@ class OsuBeatmapDetector:
         """Get osu! window title"""
         try:
             def get_title(hwnd):
-                length = ctypes.windll.user32.GetWindowTextLengthW(hwnd)
-                buff = ctypes.create_unicode_buffer(length + 1)
-                ctypes.windll.user32.GetWindowTextW(hwnd, buff, length + 1)
-                return buff.value
-
-            EnumWindowsProc = ctypes.WINFUNCTYPE(wintypes.BOOL, wintypes.HWND, wintypes.LPARAM)
+                length = _GetWindowTextLengthW(hwnd)
+                if length >= len(self._title_buffer):
+                    self._title_buffer = ctypes.create_unicode_buffer(length + 1)
+                buff = self._title_buffer
+                # Buffer is shared, only the copied part belongs to this window
+                copied = _GetWindowTextW(hwnd, buff, len(buff))
+                return buff[:copied]
+
+            # Reuse osu! window found on previous call while it is alive
+            hwnd = self._cached_hwnd
+            if hwnd and _IsWindow(hwnd) and _IsWindowVisible(hwnd):
+                title = get_title(hwnd)
+                if title.startswith("osu!"):
+                    return title
+
+            self._cached_hwnd = None
             osu_title = None
 
             def enum_callback(hwnd, lParam):
                 nonlocal osu_title
-                if ctypes.windll.user32.IsWindowVisible(hwnd):
+                if _IsWindowVisible(hwnd):
                     title = get_title(hwnd)
                     if title.startswith("osu!"):
                         osu_title = title
+                        self._cached_hwnd = hwnd
                         return False
                 return True
 
-            ctypes.windll.user32.EnumWindows(EnumWindowsProc(enum_callback), 0)
+            _EnumWindows(EnumWindowsProc(enum_callback), 0)
             return osu_title
 
         except Exception as e:
@@ -114,198 +234,376 @@ class OsuBeatmapDetector:
         artist_normalized = artist.lower().strip()
         title_normalized = title.lower().strip()
 
-        for folder_name in os.listdir(self.songs_folder):
-            folder_path = os.path.join(self.songs_folder, folder_name)
+        key = (artist_normalized, title_normalized)
+        entries = None
 
-            if not os.path.isdir(folder_path):
-                continue
+        if self._title_index is None:
+            # Skip the full scan on cold start if the beatmap folder is named as usual
+            entries = self._scan_named_folders(key)
+
+        scanned = False
+        if not entries:
+            scanned = self._ensure_index()
+            entries = self._title_index.get(key)
+
+        if not scanned and (not entries or self._folders_changed(entries)):
+            # Files added or removed inside a set folder don't touch Songs mtime
+            self._ensure_index(force=True)
+            entries = self._title_index.get(key)
+
+        for file_path, file_version, file_creator, folder_name in entries or []:
+            if difficulty:
+                if file_version and file_version.lower().strip() == difficulty.lower().strip():
+                    found_files.append((file_path, file_version, True, file_creator, folder_name))
+                else:
+                    found_files.append((file_path, file_version, False, file_creator, folder_name))
+            else:
+                found_files.append((file_path, file_version, False, file_creator, folder_name))
+
+        found_files.sort(key=lambda x: (not x[2], x[1] or ""))
+
+        return found_files
 
-            for file_name in os.listdir(folder_path):
-                if not file_name.endswith('.osu'):
+    def _folders_changed(self, entries):
+        """Check if any folder of found entries changed since it was scanned"""
+        for folder_path in {os.path.dirname(entry[0]) for entry in entries}:
+            try:
+                folder_mtime = os.stat(folder_path).st_mtime_ns
+            except OSError:
+                return True
+
+            cached = self._folder_cache.get(folder_path)
+            if not cached or cached[0] != folder_mtime:
+                return True
+
+        return False
+
+    def _ensure_index(self, force=False):
+        """
+        Scan Songs folder if it changed since the last scan
+        Returns True if a scan was made
+        """
+        try:
+            songs_mtime = os.stat(self.songs_folder).st_mtime_ns
+        except OSError:
+            songs_mtime = None
+
+        if not force and self._title_index is not None and songs_mtime == self._songs_mtime:
+            return False
+
+        self._scan_songs()
+        self._songs_mtime = songs_mtime
+        return True
+
+    def _scan_songs(self):
+        """Build (artist, title) index of all .osu files in Songs folder"""
+        index = {}
+        seen = set()
+
+        with os.scandir(self.songs_folder) as entries:
+            folders = [e for e in entries if e.is_dir()]
+
+        # Folder reads are I/O bound, so threads overlap them despite the GIL
+        with ThreadPoolExecutor(max_workers=SCAN_WORKERS) as executor:
+            scanned = executor.map(self._scan_folder, folders)
+
+            for folder_entry, results in zip(folders, scanned):
+                for file_path, meta in results:
+                    seen.add(file_path)
+                    file_artist, file_title, file_version, file_creator = meta
+
+                    if file_artist and file_title:
+                        key = (file_artist.lower().strip(), file_title.lower().strip())
+                        index.setdefault(key, []).append((file_path, file_version, file_creator, folder_entry.name))
+
+        for file_path in list(self._meta_cache):
+            if file_path not in seen:
+                del self._meta_cache[file_path]
+                self._cache_dirty = True
+
+        folder_paths = {e.path for e in folders}
+        for folder_path in list(self._folder_cache):
+            if folder_path not in folder_paths:
+                del self._folder_cache[folder_path]
+
+        self._title_index = index
+        self._save_cache()
+
+    def _scan_named_folders(self, key):
+        """
+        Find beatmap only in folders whose name mentions its artist or title
+        Folder names look like "<BeatmapSetID> <Artist> - <Title>"
+        Returns list of (path, version, creator, folder_name)
+        """
+        artist_normalized, title_normalized = key
+        title_prefix = title_normalized[:12]
+        found = []
+
+        with os.scandir(self.songs_folder) as folders:
+            for folder_entry in folders:
+                folder_lower = folder_entry.name.lower()
+                if artist_normalized not in folder_lower and title_prefix not in folder_lower:
                     continue
 
-                file_path = os.path.join(folder_path, file_name)
+                if not folder_entry.is_dir():
+                    continue
 
-                try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        lines = f.readlines()
-
-                    file_artist = None
-                    file_title = None
-                    file_version = None
-                    file_creator = None
-
-                    for line in lines[:50]:
-                        line = line.strip()
-                        if line.startswith("Artist:"):
-                            file_artist = line.split(":", 1)[1].strip()
-                        elif line.startswith("Title:"):
-                            file_title = line.split(":", 1)[1].strip()
-                        elif line.startswith("Version:"):
-                            file_version = line.split(":", 1)[1].strip()
-                        elif line.startswith("Creator:"):
-                            file_creator = line.split(":", 1)[1].strip()
+                for file_path, meta in self._scan_folder(folder_entry):
+                    file_artist, file_title, file_version, file_creator = meta
 
                     if file_artist and file_title:
-                        artist_match = file_artist.lower().strip() == artist_normalized
-                        title_match = file_title.lower().strip() == title_normalized
+                        if (file_artist.lower().strip(), file_title.lower().strip()) == key:
+                            found.append((file_path, file_version, file_creator, folder_entry.name))
 
-                        if artist_match and title_match:
-                            if difficulty:
-                                if file_version and file_version.lower().strip() == difficulty.lower().strip():
-                                    found_files.append((file_path, file_version, True, file_creator, folder_name))
-                                else:
-                                    found_files.append((file_path, file_version, False, file_creator, folder_name))
-                            else:
-                                found_files.append((file_path, file_version, False, file_creator, folder_name))
+        self._save_cache()
+        return found
+
+    def _scan_folder(self, folder_entry):
+        """
+        Read metadata of all .osu files in beatmap folder
+        Returns list of (path, (artist, title, version, creator))
+        """
+        # Adding or removing a file updates folder mtime, so unchanged folders are not listed again
+        try:
+            folder_mtime = folder_entry.stat().st_mtime_ns
+        except OSError:
+            folder_mtime = None
+
+        cached = self._folder_cache.get(folder_entry.path)
+        if cached and folder_mtime is not None and cached[0] == folder_mtime:
+            return cached[1]
+
+        results = []
+        complete = True
+
+        with os.scandir(folder_entry.path) as files:
+            osu_files = [e for e in files if e.name.endswith('.osu')]
+
+        for file_entry in osu_files:
+            file_path = file_entry.path
+
+            try:
+                mtime = file_entry.stat().st_mtime
+            except OSError:
+                continue
 
-                except Exception as e:
+            cached = self._meta_cache.get(file_path)
+            if cached and cached[0] == mtime:
+                meta = cached[1]
+            else:
+                meta = self._read_file_meta(file_path)
+                if meta is None:
+                    complete = False
                     continue
+                with self._cache_lock:
+                    self._meta_cache[file_path] = (mtime, meta)
+                    self._cache_dirty = True
 
-        found_files.sort(key=lambda x: (not x[2], x[1] or ""))
+            results.append((file_path, meta))
 
-        return found_files
+        if complete:
+            with self._cache_lock:
+                self._folder_cache[folder_entry.path] = (folder_mtime, results)
 
+        return results
 
-def read_beatmap_info(filepath):
-    """Read information from .osu file"""
+    def _read_file_meta(self, file_path):
+        """
+        Read metadata from .osu file
+        Returns: (artist, title, version, creator) or None if the file can't be read
+        """
+        try:
+            data = read_metadata_block(file_path)
+        except OSError:
+            # File may be locked by osu! or antivirus, try again on next scan
+            return None
+
+        info = parse_beatmap_info(data)
+        return info['artist'] or None, info['title'] or None, info['version'] or None, info['creator'] or None
+
+
+def read_metadata_block(filepath):
+    """Read beginning of .osu file up to the [Events] section"""
+    with open(filepath, "rb") as f:
+        if os.fstat(f.fileno()).st_size <= MMAP_MIN_SIZE:
+            data = f.read()
+            end = data.find(META_BLOCK_END)
+            return data if end == -1 else data[:end]
+
+        # Only pages up to [Events] are read from disk
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            end = mm.find(META_BLOCK_END)
+            return mm[:] if end == -1 else mm[:end]
+
+
+def parse_beatmap_info(data):
+    """Parse information from .osu metadata block"""
     info = {
         'title': '', 'artist': '', 'creator': '', 'version': '',
         'beatmap_id': '', 'hp': '', 'cs': '', 'ar': '', 'od': ''
     }
 
-    try:
-        with open(filepath, "r", encoding="utf-8") as f:
-            lines = f.readlines()
-
-        for line in lines:
-            stripped = line.strip()
-
-            if stripped.startswith("Title:"):
-                info['title'] = stripped.split(":", 1)[1].strip()
-            elif stripped.startswith("Artist:"):
-                info['artist'] = stripped.split(":", 1)[1].strip()
-            elif stripped.startswith("Creator:"):
-                info['creator'] = stripped.split(":", 1)[1].strip()
-            elif stripped.startswith("Version:"):
-                info['version'] = stripped.split(":", 1)[1].strip()
-            elif stripped.startswith("BeatmapID:"):
-                info['beatmap_id'] = stripped.split(":", 1)[1].strip()
-            elif stripped.startswith("HPDrainRate:"):
-                info['hp'] = stripped.split(":", 1)[1].strip()
-            elif stripped.startswith("CircleSize:"):
-                info['cs'] = stripped.split(":", 1)[1].strip()
-            elif stripped.startswith("ApproachRate:"):
-                info['ar'] = stripped.split(":", 1)[1].strip()
-            elif stripped.startswith("OverallDifficulty:"):
-                info['od'] = stripped.split(":", 1)[1].strip()
-    except:
-        pass
+    for match in META_RE.finditer(data):
+        key = match.group(1).decode()
+        info[FIELD_MAP[key]] = match.group(2).strip().decode("utf-8", errors="replace")
 
     return info
 
 
-def stack_beatmap(input_path, output_path, stack_x=256, stack_y=192, suffix="stacked"):
+def read_beatmap_info(filepath):
+    """Read information from .osu file"""
+    try:
+        return parse_beatmap_info(read_metadata_block(filepath))
+    except:
+        return parse_beatmap_info(b"")
+
+
+def stack_hitobject(hitobject, stack_x, stack_y):
     """
-    Create stacked version of beatmap
+    Move single [HitObjects] line (bytes) to stack position
+    Returns stacked line or None if the line is not a hit object
 
     HitObjects format:
     - Circle: x,y,time,type,hitSound,hitSample
     - Slider: x,y,time,type,hitSound,curveType|curvePoints,slides,length,edgeSounds,edgeSets,hitSample
     - Spinner: x,y,time,type,hitSound,endTime,hitSample
     """
-    try:
-        with open(input_path, "r", encoding="utf-8") as f:
-            lines = f.readlines()
+    commas = find_commas(hitobject, 6)
 
-        result = []
-        in_hitobjects = False
+    if len(commas) < 4:
+        return None
 
-        for line in lines:
-            stripped = line.strip()
+    old_x = int(hitobject[:commas[0]])
+    old_y = int(hitobject[commas[0] + 1:commas[1]])
+    obj_type = int(hitobject[commas[2] + 1:commas[3]])
 
-            if stripped.startswith("Version:"):
-                original = stripped.split(":", 1)[1].strip()
-                line = f"Version:{original} [{suffix}]\n"
+    position = b"%d,%d" % (stack_x, stack_y)
 
-            if stripped.startswith("StackLeniency:"):
-                line = "StackLeniency:0\n"
+    is_slider = (obj_type & 2) != 0
 
-            if stripped == "[HitObjects]":
-                in_hitobjects = True
-                result.append(line)
-                continue
+    if is_slider and len(commas) >= 5:
+        curve_start = commas[4] + 1
+        curve_end = commas[5] if len(commas) > 5 else len(hitobject)
+        curve_parts = hitobject[curve_start:curve_end].split(b'|')
 
-            if in_hitobjects:
-                if stripped.startswith("["):
-                    in_hitobjects = False
-                    result.append(line)
-                    continue
+        if len(curve_parts) > 1:
+            _int = int
 
-                if not stripped:
-                    result.append(line)
-                    continue
+            # Curve points keep their offset from the object position
+            shift_x = stack_x - old_x
+            shift_y = stack_y - old_y
 
-                parts = stripped.split(",")
+            for i in range(1, len(curve_parts)):
+                point = curve_parts[i]
+                colon = point.find(b':')
+                if colon == -1:
+                    continue
+                try:
+                    curve_parts[i] = b"%d:%d" % (_int(point[:colon]) + shift_x, _int(point[colon + 1:]) + shift_y)
+                except ValueError:
+                    pass
 
-                if len(parts) >= 5:
-                    old_x = int(parts[0])
-                    old_y = int(parts[1])
-                    obj_type = int(parts[3])
+            return (position + hitobject[commas[1]:curve_start]
+                    + b'|'.join(curve_parts) + hitobject[curve_end:])
 
-                    parts[0] = str(stack_x)
-                    parts[1] = str(stack_y)
+    return position + hitobject[commas[1]:]
 
-                    is_slider = (obj_type & 2) != 0
 
-                    if is_slider and len(parts) >= 6:
-                        curve_data = parts[5]
+def find_commas(line, count):
+    """Find positions of the first `count` commas in line (fewer if line is shorter)"""
+    positions = []
+    find = line.find
+    pos = -1
 
-                        if '|' in curve_data:
-                            curve_parts = curve_data.split('|')
-                            curve_type = curve_parts[0]
+    for _ in range(count):
+        pos = find(b",", pos + 1)
+        if pos == -1:
+            break
+        positions.append(pos)
 
-                            new_curve_points = [curve_type]
+    return positions
 
-                            for i in range(1, len(curve_parts)):
-                                point = curve_parts[i]
 
-                                if ':' in point:
-                                    point_parts = point.split(':')
-                                    if len(point_parts) == 2:
-                                        try:
-                                            point_x = int(point_parts[0])
-                                            point_y = int(point_parts[1])
+def stack_beatmap(input_path, output_path, stack_x=256, stack_y=192, suffix="stacked"):
+    """
+    Create stacked version of beatmap
+    """
+    # Written next to the target and moved into place once complete
+    temp_path = output_path + ".tmp"
+    version_suffix = f" [{suffix}]".encode("utf-8")
 
-                                            offset_x = point_x - old_x
-                                            offset_y = point_y - old_y
+    try:
+        with open(input_path, "rb") as fin, open(temp_path, "wb", buffering=1 << 20) as fout:
+            in_hitobjects = False
+
+            for line in fin:
+                # Rewritten lines keep the line ending of the original file
+                eol = b"\r\n" if line.endswith(b"\r\n") else b"\n"
+
+                if not in_hitobjects:
+                    head = line[:1]
+                    if head == b"[":
+                        in_hitobjects = line.strip() == b"[HitObjects]"
+                    elif head == b"V" and line.startswith(b"Version:"):
+                        original = line.split(b":", 1)[1].strip()
+                        line = b"Version:" + original + version_suffix + eol
+                    elif head == b"S" and line.startswith(b"StackLeniency:"):
+                        line = b"StackLeniency:0" + eol
+                    fout.write(line)
+                    continue
 
-                                            new_point_x = stack_x + offset_x
-                                            new_point_y = stack_y + offset_y
+                stripped = line.strip()
 
-                                            new_curve_points.append(f"{new_point_x}:{new_point_y}")
-                                        except ValueError:
-                                            new_curve_points.append(point)
-                                else:
-                                    new_curve_points.append(point)
+                if not stripped:
+                    fout.write(line)
+                    continue
 
-                            parts[5] = '|'.join(new_curve_points)
+                if stripped[:1] == b"[":
+                    in_hitobjects = False
+                    fout.write(line)
+                    continue
 
-                    line = ",".join(parts) + "\n"
+                stacked = stack_hitobject(stripped, stack_x, stack_y)
+                if stacked is not None:
+                    line = stacked + eol
 
-            result.append(line)
+                fout.write(line)
 
-        with open(output_path, "w", encoding="utf-8") as f:
-            f.writelines(result)
+        os.replace(temp_path, output_path)
 
         return True
     except Exception as e:
         print(f"Processing error: {e}")
         import traceback
         traceback.print_exc()
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
         return False
 
 
+def order_stack_jobs(jobs):
+    """
+    Group (name, input_path, output_path) jobs into batches safe to run in parallel
+    A job whose output is another job's input runs in a later batch, so stacked files
+    from previous runs are always read before they are overwritten
+    """
+    job_by_input = {job[1]: job for job in jobs}
+    batches = {}
+
+    for job in jobs:
+        # Length of the chain of jobs reading what this job writes
+        depth = 0
+        path = job[2]
+        while path in job_by_input and depth < len(jobs):
+            depth += 1
+            path = job_by_input[path][2]
+        batches.setdefault(depth, []).append(job)
+
+    return [batches[depth] for depth in sorted(batches)]
+
+
 def main():
     print("=" * 70)
     print("        OSU! BEATMAP STACKER - Console Version")
@@ -511,6 +809,7 @@ def main():
                             print(f"\n⚙️ Processing all difficulties...")
                             processed = 0
 
+                            jobs = []
                             for diff_file in all_diffs:
                                 diff_path = os.path.join(folder, diff_file)
 
@@ -521,15 +820,25 @@ def main():
                                 else:
                                     output_name = f"{name_without_ext}_{suffix}.osu"
 
-                                output_path = os.path.join(folder, output_name)
-
-                                if stack_beatmap(diff_path, output_path, stack_x, stack_y, suffix):
-                                    processed += 1
-                                    try:
-                                        diff_name = diff_file.rsplit('[', 1)[1].rsplit(']', 1)[0]
-                                        print(f"   ✓ [{diff_name}]")
-                                    except:
-                                        print(f"   ✓ {diff_file}")
+                                jobs.append((diff_file, diff_path, os.path.join(folder, output_name)))
+
+                            batches = order_stack_jobs(jobs)
+
+                            workers = min(8, os.cpu_count() or 1)
+                            with ThreadPoolExecutor(max_workers=workers) as executor:
+                                for batch in batches:
+                                    results = executor.map(
+                                        lambda job: stack_beatmap(job[1], job[2], stack_x, stack_y, suffix),
+                                        batch
+                                    )
+                                    for (diff_file, _, _), ok in zip(batch, results):
+                                        if ok:
+                                            processed += 1
+                                            try:
+                                                diff_name = diff_file.rsplit('[', 1)[1].rsplit(']', 1)[0]
+                                                print(f"   ✓ [{diff_name}]")
+                                            except:
+                                                print(f"   ✓ {diff_file}")
 
                             print(f"\n✅ Processed difficulties: {processed}")
                             print(f"📁 Folder: {os.path.basename(folder)}")